@@ -0,0 +1,26 @@
+"""Precomputed minimax guesses after Knuth's initial guess. Generated by make_knuth_table.py, do not edit."""
+
+# Colors, code length and Knuth's initial guess the table is valid for
+COLORS = ['Red', 'Green', 'Yellow', 'Blue', 'Purple', 'Orange']
+CODE_LENGTH = 4
+FIRST_GUESS = ('Red', 'Red', 'Green', 'Green')
+
+# SECOND_GUESS[allow_duplicates][feedback of FIRST_GUESS] is the next guess to make
+SECOND_GUESS = {False: {(0, 0): ('Yellow', 'Blue', 'Purple', 'Orange'),
+         (0, 1): ('Green', 'Yellow', 'Red', 'Blue'),
+         (0, 2): ('Green', 'Yellow', 'Blue', 'Purple'),
+         (1, 0): ('Red', 'Yellow', 'Green', 'Blue'),
+         (1, 1): ('Red', 'Yellow', 'Blue', 'Purple'),
+         (2, 0): ('Red', 'Yellow', 'Blue', 'Purple')},
+ True: {(0, 0): ('Yellow', 'Yellow', 'Blue', 'Purple'),
+        (0, 1): ('Green', 'Yellow', 'Blue', 'Blue'),
+        (0, 2): ('Green', 'Yellow', 'Blue', 'Blue'),
+        (0, 3): ('Red', 'Green', 'Red', 'Yellow'),
+        (0, 4): ('Green', 'Green', 'Red', 'Red'),
+        (1, 0): ('Red', 'Yellow', 'Blue', 'Blue'),
+        (1, 1): ('Red', 'Red', 'Yellow', 'Blue'),
+        (1, 2): ('Red', 'Green', 'Red', 'Yellow'),
+        (2, 0): ('Red', 'Green', 'Yellow', 'Blue'),
+        (2, 1): ('Red', 'Green', 'Green', 'Yellow'),
+        (2, 2): ('Red', 'Green', 'Red', 'Yellow'),
+        (3, 0): ('Red', 'Green', 'Green', 'Yellow')}}
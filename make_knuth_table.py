@@ -0,0 +1,54 @@
+"""Generate knuth_table.py, the precomputed second guesses after Knuth's initial guess.
+
+Run it again whenever the colors, the code length or the minimax strategy in mastermind.py change:
+
+    python make_knuth_table.py
+"""
+import os
+import pprint
+
+from mastermind import CODE_LENGTH, COLORS, MastermindGame, calculate_feedback, knuth_initial_guess
+
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'knuth_table.py')
+
+
+def second_guesses(allow_duplicates: bool) -> dict[tuple[int, int], tuple[str, ...]]:
+    """Compute the next guess for every feedback the initial guess can get.
+
+    Args:
+        allow_duplicates (bool): Whether the secret code can have duplicate colors.
+
+    Returns:
+        dict: The next guess to make, keyed by the feedback of the initial guess.
+    """
+    first_guess = knuth_initial_guess(CODE_LENGTH)
+    game = MastermindGame(allow_duplicates, CODE_LENGTH)
+    # Every feedback the initial guess can get is the feedback against one of the codes
+    feedbacks = sorted({calculate_feedback(first_guess, code) for code in game.all_codes})
+    table = {}
+    for feedback in feedbacks:
+        if feedback == (CODE_LENGTH, 0):
+            continue  # The game is already solved
+        game = MastermindGame(allow_duplicates, CODE_LENGTH)
+        game.filter_possible_codes(first_guess, feedback)
+        # No guess has been recorded in this game, so next_guess() runs the full strategy instead of the table
+        table[feedback] = game.next_guess()
+    return table
+
+
+def main():
+    """Write knuth_table.py next to mastermind.py."""
+    first_guess = knuth_initial_guess(CODE_LENGTH)
+    tables = {allow_duplicates: second_guesses(allow_duplicates) for allow_duplicates in (True, False)}
+    with open(TABLE_PATH, 'w') as file:
+        file.write('"""Precomputed minimax guesses after Knuth\'s initial guess. Generated by make_knuth_table.py, do not edit."""\n\n')
+        file.write('# Colors, code length and Knuth\'s initial guess the table is valid for\n')
+        file.write(f'COLORS = {COLORS!r}\n')
+        file.write(f'CODE_LENGTH = {CODE_LENGTH!r}\n')
+        file.write(f'FIRST_GUESS = {first_guess!r}\n\n')
+        file.write('# SECOND_GUESS[allow_duplicates][feedback of FIRST_GUESS] is the next guess to make\n')
+        file.write(f'SECOND_GUESS = {pprint.pformat(tables, width=120, sort_dicts=True)}\n')
+
+
+if __name__ == '__main__':
+    main()
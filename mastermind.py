@@ -1,13 +1,40 @@
-import itertools
 import pdb
 import random
+from collections.abc import Callable
+import numpy as np
 import pygame
 
+try:
+    import knuth_table  # Precomputed second guesses, generated by make_knuth_table.py
+except ImportError:  # Not generated yet, the second guess is computed like every other guess
+    knuth_table = None
+
+try:
+    from numba import get_num_threads, njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba is optional, the solver falls back to plain NumPy without it
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that leaves the function as plain Python."""
+        return lambda func: func
+
 # Constants
 COLORS = ['Red', 'Green', 'Yellow', 'Blue', 'Purple', 'Orange']
 WIDTH, HEIGHT = 800, 600  # Pygame window dimensions
 CODE_LENGTH = 4
 PEG_SIZE = 50  # Size of each peg in the visualization
+RESTRICTED_SEARCH_SIZE = 20  # With this many possible codes or fewer, the possible codes are tried as guesses first
+TURN_DELAY = 2000  # Milliseconds each turn stays on screen, including the time spent computing the guess
+TURN_TIMER_EVENT = pygame.USEREVENT + 1  # Posted by pygame when the turn delay is over
+N_COLORS = len(COLORS)
+COLOR_INDEX = {color: i for i, color in enumerate(COLORS)}  # Map each color name to its small integer code (0..5)
+# Masks of the packed feedback kernel, with one 4-bit nibble per color (see _packed_feedback_key)
+COLOR_NIBBLES = sum(1 << (4 * color) for color in range(N_COLORS))  # Bit 0 of every color nibble, 0x111111 for 6 colors
+COLOR_HIGH_BITS = 8 * COLOR_NIBBLES  # Bit 3 of every color nibble, 0x888888 for 6 colors
+COLOR_BITS = 0xF * COLOR_NIBBLES  # All the bits of the color nibbles, 0xFFFFFF for 6 colors
+COLOR_SUM_SHIFT = 4 * (N_COLORS - 1)  # Position of the top color nibble, 20 for 6 colors
 
 
 def calculate_feedback(guess: tuple[str, ...], code: tuple[str, ...]) -> tuple[int, int]:
@@ -35,28 +62,220 @@ def calculate_feedback(guess: tuple[str, ...], code: tuple[str, ...]) -> tuple[i
     # Subtracting the correct_position from the total correct colors gives the correct colors but wrong positions
     # e.g., guess = ('Red', 'Green', 'Green', 'Blue') and code = ('Red', 'Red', 'Green', 'Yellow')
     # set(guess) -> {'Red', 'Green', 'Blue'}
-    # sum(min(guess.count(color), code.count(color)) for color in set(guess)) -> 3 (Red, Green, and Green are correct)
+    # sum(min(guess.count(color), code.count(color)) for color in set(guess)) -> 1 + 1 + 0 = 2 (one Red and one Green are correct)
     # correct_position = 2 (Red and Green are in the correct position)
-    # correct_color = 3 - 2 = 1 (Green is correct but in the wrong position)
+    # correct_color = 2 - 2 = 0 (no correct color is in the wrong position)
     correct_color = sum(min(guess.count(color), code.count(color)) for color in set(guess)) - correct_position
     return correct_position, correct_color
 
 
-def draw_button(screen: pygame.Surface, rect: pygame.Rect, text: str, font: pygame.font.Font, color_map: dict[str, tuple[int, int, int]]):
+def knuth_initial_guess(code_length: int) -> tuple[str, ...]:
+    """Get Knuth's initial guess: the first color for the first half of the pegs and the second color for the rest.
+
+    Args:
+        code_length (int): Number of pegs in the code.
+
+    Returns:
+        tuple: The initial guess, e.g. ('Red', 'Red', 'Green', 'Green') for 4 pegs.
+    """
+    # Calculate the number of repetitions needed for the initial guess
+    half_length = code_length // 2
+    return tuple(COLORS[0] if i < half_length else COLORS[1] for i in range(code_length))
+
+
+def encode_codes(codes: list[tuple[str, ...]]) -> np.ndarray:
+    """Encode a list of color codes as a 2D array of color indices.
+
+    Args:
+        codes (list): The codes to encode, each a tuple of color names.
+
+    Returns:
+        np.ndarray: A (N, code_length) uint8 array where each color is replaced by its index in COLORS.
+    """
+    return np.array([[COLOR_INDEX[color] for color in code] for code in codes], dtype=np.uint8)
+
+
+def decode_codes(codes_np: np.ndarray) -> list[tuple[str, ...]]:
+    """Decode a 2D array of color indices back to color codes, the inverse of encode_codes().
+
+    Args:
+        codes_np (np.ndarray): A (N, code_length) array of color indices.
+
+    Returns:
+        list: The codes, each a tuple of color names.
+    """
+    return [tuple(COLORS[color] for color in code) for code in codes_np.tolist()]
+
+
+def color_counts(codes_np: np.ndarray) -> np.ndarray:
+    """Count how many pegs of each color appear in every code.
+
+    Args:
+        codes_np (np.ndarray): A (N, code_length) uint8 array of encoded codes.
+
+    Returns:
+        np.ndarray: A (N, N_COLORS) uint8 array where entry [i, c] is the number of pegs of color c in code i.
+    """
+    counts = np.zeros((len(codes_np), N_COLORS), dtype=np.uint8)
+    # np.add.at is unbuffered, so repeated colors in the same row are counted once per peg
+    np.add.at(counts, (np.arange(len(codes_np))[:, None], codes_np), 1)
+    return counts
+
+
+def feedback_keys(guesses_np: np.ndarray, guesses_counts: np.ndarray, codes_np: np.ndarray, codes_counts: np.ndarray) -> np.ndarray:
+    """Calculate the feedback of every guess against every code as a single 2D tensor.
+
+    Each feedback (correct_position, correct_color) is encoded as the integer key
+    correct_position * (code_length + 2) + correct_color.
+
+    Args:
+        guesses_np (np.ndarray): The encoded guesses, shape (G, code_length).
+        guesses_counts (np.ndarray): color_counts(guesses_np), shape (G, N_COLORS).
+        codes_np (np.ndarray): The encoded codes, shape (M, code_length).
+        codes_counts (np.ndarray): color_counts(codes_np), shape (M, N_COLORS).
+
+    Returns:
+        np.ndarray: A (G, M) int8 array where entry [g, m] is the feedback key of guess g against code m.
+    """
+    key_base = guesses_np.shape[1] + 2
+    # Work on one peg position / one color at a time (struct of arrays): each column is a small contiguous uint8 array,
+    # so only (G, M) temporaries are created instead of (G, M, code_length) and (G, M, N_COLORS) ones
+    guess_columns, code_columns = np.ascontiguousarray(guesses_np.T), np.ascontiguousarray(codes_np.T)
+    guess_hist, code_hist = np.ascontiguousarray(guesses_counts.T), np.ascontiguousarray(codes_counts.T)
+
+    correct_position = np.zeros((len(guesses_np), len(codes_np)), dtype=np.int8)
+    for guess_column, code_column in zip(guess_columns, code_columns):
+        correct_position += guess_column[:, None] == code_column[None, :]
+    total = np.zeros((len(guesses_np), len(codes_np)), dtype=np.int8)
+    for guess_color, code_color in zip(guess_hist, code_hist):
+        total += np.minimum(guess_color[:, None], code_color[None, :])
+    correct_color = total - correct_position
+    return correct_position * key_base + correct_color
+
+
+def pack_nibbles(rows: np.ndarray) -> np.ndarray:
+    """Pack every row of small integers into one uint32 word, one 4-bit nibble per column.
+
+    Args:
+        rows (np.ndarray): A (N, K) array with K <= 8 and values below 16, e.g. encoded codes or color_counts().
+
+    Returns:
+        np.ndarray: A length N uint32 array where bits 4*k..4*k+3 of word i hold rows[i, k].
+    """
+    words = np.zeros(len(rows), dtype=np.uint32)
+    for k in range(rows.shape[1]):
+        words |= rows[:, k].astype(np.uint32) << np.uint32(4 * k)
+    return words
+
+
+@njit(inline='always')
+def _packed_feedback_key(guess_word: int, guess_hist: int, code_word: int, code_hist: int, code_length: int) -> int:
+    """Calculate the feedback key of a packed guess against a packed code with bit arithmetic only.
+
+    Words come from pack_nibbles() of the encoded codes and of their color_counts(). Both code_length and N_COLORS
+    must be at most 7, so that peg values and color counts stay below 8 and the products fit in 64 bits.
+
+    Returns:
+        int: The feedback key, see feedback_keys().
+    """
+    # Nibbles of the XOR are zero exactly where the pegs match; folding them down leaves 1 in bit 0 of each differing nibble
+    x = guess_word ^ code_word
+    x |= x >> 1
+    x |= x >> 2
+    # Multiplying by 0x11111111 sums all the nibbles into the top one (a popcount of the 0x11111111 bits)
+    differ = (((x & 0x11111111) * 0x11111111) & 0xFFFFFFFF) >> 28
+    correct_position = code_length - differ
+    # SWAR min of the two color histograms: counts are below 8, so setting bit 3 of each nibble before subtracting
+    # keeps every nibble from borrowing, and bit 3 survives exactly where guess_hist >= code_hist
+    ge = (((guess_hist | COLOR_HIGH_BITS) - code_hist) & COLOR_HIGH_BITS) >> 3
+    mask = ge * 0xF
+    minimum = (code_hist & mask) | (guess_hist & ~mask & COLOR_BITS)
+    # Same nibble sum trick, on the N_COLORS color nibbles
+    total = ((minimum * COLOR_NIBBLES) >> COLOR_SUM_SHIFT) & 0xF
+    return correct_position * (code_length + 2) + total - correct_position
+
+
+@njit(parallel=True, cache=True)
+def _packed_feedback_keys(guess_words: np.ndarray, guess_hists: np.ndarray, code_words: np.ndarray, code_hists: np.ndarray, code_length: int) -> np.ndarray:
+    """Build the same tensor as feedback_keys() from bit-packed codes, see pack_nibbles().
+
+    Returns:
+        np.ndarray: A (G, M) int8 array where entry [g, m] is the feedback key of guess g against code m.
+    """
+    keys = np.empty((guess_words.shape[0], code_words.shape[0]), dtype=np.int8)
+    for g in prange(guess_words.shape[0]):
+        guess_word, guess_hist = np.int64(guess_words[g]), np.int64(guess_hists[g])
+        for m in range(code_words.shape[0]):
+            keys[g, m] = _packed_feedback_key(guess_word, guess_hist, np.int64(code_words[m]), np.int64(code_hists[m]), code_length)
+    return keys
+
+
+@njit(parallel=True, cache=True)
+def _minimax_best(feedback_tensor: np.ndarray, guess_order: np.ndarray, possible_idx: np.ndarray, n_keys: int, n_chunks: int) -> tuple[int, int]:
+    """Find the guess with the smallest maximum eliminations, skipping guesses as soon as they can't win.
+
+    The guesses are split into n_chunks interleaved chunks that are scanned in parallel, each with its own best bound,
+    so every chunk gets a share of the first (most promising) guesses. On ties the guess tried first wins.
+
+    Args:
+        feedback_tensor (np.ndarray): The (G, N) feedback keys of every guess against every code.
+        guess_order (np.ndarray): The rows of the guesses to try, in the order they are tried.
+        possible_idx (np.ndarray): The columns of the codes that are still possible.
+        n_keys (int): Number of distinct feedback keys.
+        n_chunks (int): Number of chunks, usually the number of CPU cores.
+
+    Returns:
+        tuple: (best_guess, min_max_eliminations) where best_guess is a row of feedback_tensor.
+    """
+    chunk_best = np.zeros(n_chunks, dtype=np.int64)  # Position in guess_order of the best guess of each chunk
+    chunk_min = np.zeros(n_chunks, dtype=np.int64)  # Maximum eliminations of the best guess of each chunk
+    # One feedback count buffer per chunk, allocated once and cleared between guesses
+    chunk_counts = np.zeros((n_chunks, n_keys), dtype=np.int32)
+    for chunk in prange(n_chunks):
+        chunk_best[chunk] = chunk
+        feedback_counts = chunk_counts[chunk]
+        min_max_eliminations = possible_idx.shape[0] + 1  # Worse than any real guess
+        for position in range(chunk, guess_order.shape[0], n_chunks):
+            g = guess_order[position]
+            feedback_counts[:] = 0  # Clearing n_keys counts is cheaper than allocating a new buffer
+            max_eliminations = 0
+            for m in possible_idx:
+                key = feedback_tensor[g, m]
+                feedback_counts[key] += 1
+                if feedback_counts[key] > max_eliminations:
+                    max_eliminations = feedback_counts[key]
+                    # One feedback group is already as large as the best guess so far, this guess can't be better
+                    if max_eliminations >= min_max_eliminations:
+                        break
+            if max_eliminations < min_max_eliminations:
+                min_max_eliminations = max_eliminations
+                chunk_best[chunk] = position
+        chunk_min[chunk] = min_max_eliminations
+
+    # Pick the best chunk, the one whose best guess comes first in guess_order on ties
+    best = 0
+    for chunk in range(1, n_chunks):
+        if chunk_min[chunk] < chunk_min[best] or (chunk_min[chunk] == chunk_min[best] and chunk_best[chunk] < chunk_best[best]):
+            best = chunk
+    return guess_order[chunk_best[best]], chunk_min[best]
+
+
+def draw_button(screen: pygame.Surface, rect: pygame.Rect, text: str,
+                render_text: Callable[[str, tuple[int, int, int]], pygame.Surface], color_map: dict[str, tuple[int, int, int]]):
     """Draw a button on the screen with readable text.
 
     Args:
         screen (pygame.Surface): The surface to draw on.
         rect (pygame.Rect): The rectangle defining the button.
         text (str): The text to display on the button.
-        font (pygame.font.Font): The font to use for the text.
+        render_text (Callable): The function rendering (text, color) to a surface, e.g. GameUI.render_text which reuses cached text.
         color_map (dict): A dictionary mapping color names to RGB values
 
     :returns: None
     """
     pygame.draw.rect(screen, (200, 200, 200), rect)  # Light gray background
     pygame.draw.rect(screen, color_map['Black'], rect, 2)  # Black border of width 2
-    text_surf = font.render(text, True, color_map['Black'])  # Black text. Anti-aliasing means smooth edges and it is enabled.
+    text_surf = render_text(text, color_map['Black'])  # Black text
     # rect.x and rect.y are the top-left corner of the rectangle
     # rect.width and rect.height are the dimensions of the rectangle
     # rect.x + rect.width // 2 and rect.y + rect.height // 2 are the center of the rectangle
@@ -79,13 +298,21 @@ class MastermindGame:
         """
         self.allow_duplicates = allow_duplicates  # Whether the secret code can have duplicate colors
         self.code_length = code_length  # Number of pegs in the secret code
-        self.all_codes = (
-            list(itertools.product(COLORS, repeat=code_length))  # All possible codes with or without duplicates
-            if allow_duplicates
-            else list(itertools.permutations(COLORS, code_length))  # All possible codes without duplicates
-        )
+        # All possible codes as a (N, code_length) array of color indices, in the same order as itertools.product
+        # np.indices gives the value of every peg for every position in the grid of N_COLORS ** code_length codes
+        self.all_codes_np = np.indices((N_COLORS,) * code_length, dtype=np.uint8).reshape(code_length, -1).T
+        if not allow_duplicates:
+            # Keep the codes without duplicates: once the pegs are sorted, duplicates are equal neighbors
+            sorted_pegs = np.sort(self.all_codes_np, axis=1)
+            self.all_codes_np = self.all_codes_np[(sorted_pegs[:, 1:] != sorted_pegs[:, :-1]).all(axis=1)]
         self.secret_code = tuple(random.sample(COLORS, code_length))  # Randomly generated secret code
-        self.possible_codes = self.all_codes[:]  # Copy the all_codes list to initialize the possible_codes list
+        self.all_counts = color_counts(self.all_codes_np)  # Per-color peg counts of each code
+        # Row of each code in all_codes_np, looked up by the code read as a base N_COLORS number (-1 if it is not a row)
+        self._place_values = N_COLORS ** np.arange(code_length - 1, -1, -1)
+        self._code_rows = np.full(N_COLORS ** code_length, -1, dtype=np.int64)
+        self._code_rows[self.all_codes_np @ self._place_values] = np.arange(len(self.all_codes_np))
+        self.alive = np.ones(len(self.all_codes_np), dtype=bool)  # alive[i] is True while all_codes[i] is still a possible code
+        self._feedback_tensor = None  # Cached feedback keys of every code against every code, built on first use
         self.guesses = []  # List to store all guesses made by the agent
         self.feedbacks = []  # List to store the feedback for each guess
 
@@ -109,56 +336,157 @@ class MastermindGame:
 
         # Filter possible codes based on feedback
         # This will reduce the solution space by eliminating codes that do not match the feedback
-        self.possible_codes = [code for code in self.possible_codes if calculate_feedback(guess, code) == feedback]
+        self.filter_possible_codes(guess, feedback)
         return False  # Game is not solved yet
 
+    def filter_possible_codes(self, guess: tuple[str, ...], feedback: tuple[int, int]):
+        """Remove the possible codes that would not have given this feedback for this guess.
+
+        Args:
+            guess (tuple): The guessed combination of colors.
+            feedback (tuple): The feedback received for the guess.
+
+        Returns:
+            None
+        """
+        guess_np = encode_codes([guess])
+        guess_row = self._code_rows[int(guess_np[0] @ self._place_values)]
+        if guess_row >= 0:
+            # all_codes never changes, so the feedback of this guess against every code is already in the cached tensor
+            guess_keys = self.feedback_tensor()[guess_row]
+        else:
+            # e.g., Knuth's initial guess has duplicates and is not in all_codes when duplicates are not allowed
+            guess_keys = feedback_keys(guess_np, color_counts(guess_np), self.all_codes_np, self.all_counts)[0]
+        self.alive &= guess_keys == feedback[0] * (self.code_length + 2) + feedback[1]
+
+    @property
+    def all_codes(self) -> list[tuple[str, ...]]:
+        """All the codes of this game as tuples of color names, decoded from all_codes_np."""
+        return decode_codes(self.all_codes_np)
+
+    @property
+    def possible_codes(self) -> list[tuple[str, ...]]:
+        """The codes that are still consistent with all the feedback so far."""
+        return decode_codes(self.all_codes_np[self.alive])
+
+    def feedback_tensor(self) -> np.ndarray:
+        """Get the feedback keys of every code in all_codes against every code in all_codes.
+
+        The tensor is computed once per game and cached, since all_codes never changes.
+        Columns of codes that are no longer possible are simply masked out with self.alive.
+
+        Returns:
+            np.ndarray: A (N, N) int8 array, see feedback_keys().
+        """
+        if self._feedback_tensor is None:
+            if NUMBA_AVAILABLE and self.code_length <= 7 and N_COLORS <= 7:
+                # Codes and histograms fit in one uint32 word each, so every feedback is a handful of integer operations
+                words, hists = pack_nibbles(self.all_codes_np), pack_nibbles(self.all_counts)
+                self._feedback_tensor = _packed_feedback_keys(words, hists, words, hists, self.code_length)
+            else:
+                self._feedback_tensor = feedback_keys(self.all_codes_np, self.all_counts, self.all_codes_np, self.all_counts)
+        return self._feedback_tensor
+
     def next_guess(self) -> tuple[str, ...]:
         """Get the next guess using the minimax strategy.
 
         Returns:
             tuple: The next guess to make.
         """
+        # After Knuth's initial guess, the minimax answer only depends on its feedback, so it is precomputed
+        # in knuth_table.py (run make_knuth_table.py to regenerate it)
+        if len(self.guesses) == 1:
+            second_guess = self._second_guess_from_table()
+            if second_guess is not None:
+                return second_guess
         # If only one code remains, it must be the solution
-        if len(self.possible_codes) == 1:
+        # With two codes left, guessing one of them is already optimal: it either wins or leaves only the other one,
+        # which is the same result the minimax would pick through its tie-break, without scanning every guess
+        if np.count_nonzero(self.alive) <= 2:
             return self.possible_codes[0]
+        # With a few codes left, a possible code often tells all the others apart, which no guess can beat
+        if np.count_nonzero(self.alive) <= RESTRICTED_SEARCH_SIZE:
+            guess = self._pick_from_possible()
+            if guess is not None:
+                return guess
         # Use Minimax strategy to select the next guess
         print('MiniMax Guess')
         return self._minimax_guess()
 
+    def _second_guess_from_table(self) -> tuple[str, ...] | None:
+        """Look up the second guess in knuth_table.py, if the table was generated for this game.
+
+        Returns:
+            tuple: The next guess to make, or None if there is no table, it was generated for other colors
+            or another code length, or the first guess was not the table's FIRST_GUESS.
+        """
+        if knuth_table is None:
+            return None
+        # A table generated before a change of COLORS or code length would give wrong guesses, so it is ignored
+        if getattr(knuth_table, 'COLORS', None) != COLORS or getattr(knuth_table, 'CODE_LENGTH', None) != self.code_length:
+            return None
+        if self.guesses[0] != knuth_table.FIRST_GUESS:
+            return None
+        return knuth_table.SECOND_GUESS[self.allow_duplicates].get(self.feedbacks[0])
+
+    def _pick_from_possible(self) -> tuple[str, ...] | None:
+        """Find a possible code that gives a different feedback for every possible code, considering only possible codes.
+
+        Such a guess leaves at most one code after its feedback, so it is optimal, and it is also the one
+        _minimax_guess() would pick since possible codes are tried first there.
+
+        Returns:
+            tuple: The next guess to make, or None if no possible code tells all the possible codes apart.
+        """
+        possible_idx = np.flatnonzero(self.alive)
+        # Feedback of every possible code against every possible code, read from the cached tensor
+        keys = self.feedback_tensor()[np.ix_(possible_idx, possible_idx)]
+        for guess_idx, row in zip(possible_idx, keys):
+            if np.bincount(row).max() == 1:
+                return decode_codes(self.all_codes_np[[guess_idx]])[0]
+        return None
+
     def _minimax_guess(self) -> tuple[str, ...]:
         """Find the guess that minimizes the maximum eliminations.
 
+        Among guesses with the same maximum eliminations, one that is still a possible code is preferred,
+        since it may be the secret code and win the game right away.
+
         Returns:
             tuple: The next guess to make.
         """
-        best_guess = None  # Initialize the best guess
-        min_max_eliminations = float('inf')  # Initialize the minimum maximum eliminations. It means the maximum number of codes that can be eliminated.
-
-        # Iterate over all possible codes to determine the best guess
-        i=1
-        for guess in self.all_codes:
-            print(f'Guess {i} / {len(self.all_codes)}')
-            i+=1
-            # Dictionary to store feedback counts
-            feedback_counts = {}
-
-            # Simulate feedback for this guess against all possible codes
-            for code in self.possible_codes:
-                feedback = calculate_feedback(guess, code)  # Calculate feedback for the guess
-                feedback_counts[feedback] = feedback_counts.get(feedback, 0) + 1  # Count the feedback
-
-            # Calculate the maximum eliminations for this guess
+        n_keys = (self.code_length + 2) ** 2  # Number of distinct feedback keys
+
+        possible_idx = np.flatnonzero(self.alive)
+        # Try the possible codes first: good guesses are found early, which lets the pruning skip more work,
+        # and on ties the first guess wins, so a guess that could be the secret code itself is preferred (Knuth's tie-break)
+        guess_order = np.concatenate((possible_idx, np.flatnonzero(~self.alive)))
+
+        if NUMBA_AVAILABLE:
+            # The compiled kernel reads the cached tensor in place, scores the guesses on all CPU cores
+            # and stops scoring a guess once it can't beat the best one
+            n_chunks = min(get_num_threads(), len(guess_order))  # One chunk of guesses per CPU core
+            best_idx, _ = _minimax_best(self.feedback_tensor(), guess_order, possible_idx, n_keys, n_chunks)
+        else:
+            # Feedback of every guess against every possible code, shape (len(all_codes), len(possible_codes))
+            keys = self.feedback_tensor()[guess_order][:, self.alive]
+            # Count how many possible codes give each feedback, for every guess
+            # Offsetting row g by g * n_keys lets a single np.bincount count all rows separately
+            offsets = np.arange(len(keys))[:, None] * n_keys
+            feedback_counts = np.bincount((keys + offsets).ravel(), minlength=len(keys) * n_keys).reshape(len(keys), n_keys)
+
+            # Calculate the maximum eliminations for each guess
             # This is done to determine the guess that will eliminate the maximum number of codes
-            max_eliminations = max(feedback_counts.values())
+            max_eliminations = feedback_counts.max(axis=1)
 
-            # Select the guess that minimizes the maximum eliminations
-            if max_eliminations < min_max_eliminations:
-                min_max_eliminations = max_eliminations
-                best_guess = guess
+            # Select the guess that minimizes the maximum eliminations (argmin keeps the first one on ties)
+            best_idx = guess_order[max_eliminations.argmin()]
+
+        best_guess = decode_codes(self.all_codes_np[[best_idx]])[0]
         # e.g., possible_codes = [('Red', 'Red', 'Green', 'Green'), ('Red', 'Green', 'Green', 'Red')]
         # all_codes = [('Red', 'Red', 'Red', 'Red'), ('Red', 'Red', 'Red', 'Green'), ('Red', 'Red', 'Red', 'Yellow'), ...]
         # guess = ('Red', 'Red', 'Red', 'Red')
-        # feedback_counts = {(4, 0): 1, (3, 0): 6, (2, 0): 12, (1, 0): 6, (0, 0): 1, (2, 1): 6, (1, 1): 6, (0, 1): 6}
+        # feedback_counts -> {(4, 0): 1, (3, 0): 6, (2, 0): 12, (1, 0): 6, (0, 0): 1, (2, 1): 6, (1, 1): 6, (0, 1): 6} (stored by key)
         # max_eliminations = 12
         # min_max_eliminations = 6
         # best_guess = ('Red', 'Red', 'Red', 'Green')
@@ -184,6 +512,28 @@ class GameUI:
             'Black': (0, 0, 0),
             'White': (255, 255, 255),
         }
+        # The fade overlay never changes, so it is created once instead of on every frame of the restart screen
+        # convert() matches the display pixel format for faster blitting, set_alpha() makes the whole surface semi-transparent
+        self._overlay = pygame.Surface((WIDTH, HEIGHT)).convert()
+        self._overlay.set_alpha(150)  # Set the transparency level (0-255)
+        self._overlay.fill(self.color_map['Black'])  # Fill the surface with black color
+        # Rendering text rasterizes every glyph, so each (text, color) is rendered once and the surface is reused on later frames
+        self._text_cache: dict[tuple[str, tuple[int, int, int]], pygame.Surface] = {}
+
+    def render_text(self, text: str, color: tuple[int, int, int]) -> pygame.Surface:
+        """Render text with the UI font, reusing the surface if the same text was rendered before.
+
+        Args:
+            text (str): The text to render.
+            color (tuple): The RGB color of the text.
+
+        Returns:
+            pygame.Surface: The rendered text.
+        """
+        key = (text, color)
+        if key not in self._text_cache:
+            self._text_cache[key] = self.font.render(text, True, color)  # Anti-aliasing means smooth edges and it is enabled.
+        return self._text_cache[key]
 
     def show_menu(self) -> bool | None:
         """Display the main menu to ask if duplicates are allowed.
@@ -195,13 +545,13 @@ class GameUI:
         # Loop until the user selects an option. Loop actually keeps the window open.
         while allow_duplicates is None:
             self.screen.fill(self.color_map['White'])  # Fill the screen with white color
-            question_text = self.font.render('Allow duplicates in the secret code?', True, self.color_map['Black'])
+            question_text = self.render_text('Allow duplicates in the secret code?', self.color_map['Black'])
             self.screen.blit(question_text, (WIDTH // 2 - 200, HEIGHT // 2 - 100))  # Draw the question text
 
             yes_button = pygame.Rect(WIDTH // 2 - 100, HEIGHT // 2, 80, 40)
             no_button = pygame.Rect(WIDTH // 2 + 20, HEIGHT // 2, 80, 40)
-            draw_button(self.screen, yes_button, 'Yes', self.font, self.color_map)
-            draw_button(self.screen, no_button, 'No', self.font, self.color_map)
+            draw_button(self.screen, yes_button, 'Yes', self.render_text, self.color_map)
+            draw_button(self.screen, no_button, 'No', self.render_text, self.color_map)
 
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
@@ -240,17 +590,36 @@ class GameUI:
             # PEG_SIZE // 2 is the radius of the peg.
             pygame.draw.circle(self.screen, self.color_map[color], (x_offset + i * (PEG_SIZE + 10), y_offset), PEG_SIZE // 2)
 
-        feedback_text = self.font.render(f'Correct: {feedback[0]} | Misplaced: {feedback[1]}', True, self.color_map['Black'])
+        feedback_text = self.render_text(f'Correct: {feedback[0]} | Misplaced: {feedback[1]}', self.color_map['Black'])
         # CODE_LENGTH * (PEG_SIZE + 20) is the total width of the guess area (Circle + Padding).
         # x_offset + CODE_LENGTH * (PEG_SIZE + 20) is the distance from the left edge of the window.
         self.screen.blit(feedback_text, (x_offset + CODE_LENGTH * (PEG_SIZE + 20), y_offset - 10))
 
     def fade_overlay(self):
         """Draw a semi-transparent overlay to fade the background."""
-        overlay = pygame.Surface((WIDTH, HEIGHT))  # Create a new surface with the same dimensions as the window
-        overlay.set_alpha(150)  # Set the transparency level (0-255)
-        overlay.fill(self.color_map['Black'])  # Fill the surface with black color
-        self.screen.blit(overlay, (0, 0))  # Draw the overlay on the screen in the top-left corner
+        self.screen.blit(self._overlay, (0, 0))  # Draw the overlay on the screen in the top-left corner
+
+    def wait(self, milliseconds: int) -> bool:
+        """Wait for the given time while still handling window events, so the window stays responsive.
+
+        Args:
+            milliseconds (int): How long to wait. Nothing is waited for if it is not positive.
+
+        Returns:
+            bool: True once the time is over, False if the user closed the window.
+        """
+        if milliseconds > 0:
+            pygame.time.set_timer(TURN_TIMER_EVENT, milliseconds, loops=1)  # Post TURN_TIMER_EVENT once after the delay
+        else:
+            pygame.event.post(pygame.event.Event(TURN_TIMER_EVENT))  # Still handle the events that are already queued
+        while True:
+            event = pygame.event.wait()  # Sleep until the next event instead of blocking the event queue
+            if event.type == pygame.QUIT:
+                pygame.time.set_timer(TURN_TIMER_EVENT, 0)  # Cancel the pending timer
+                pygame.quit()
+                return False
+            elif event.type == TURN_TIMER_EVENT:
+                return True
 
     def restart_screen(self, game: MastermindGame) -> bool:
         """Display the restart screen over the solved solution.
@@ -271,8 +640,8 @@ class GameUI:
 
             restart_button = pygame.Rect(WIDTH // 2 - 100, HEIGHT // 2 - 30, 100, 40)  # At left of the center
             exit_button = pygame.Rect(WIDTH // 2 + 40, HEIGHT // 2 - 30, 80, 40)  # At right of the center
-            draw_button(self.screen, restart_button, 'Restart', self.font, self.color_map)
-            draw_button(self.screen, exit_button, 'Exit', self.font, self.color_map)
+            draw_button(self.screen, restart_button, 'Restart', self.render_text, self.color_map)
+            draw_button(self.screen, exit_button, 'Exit', self.render_text, self.color_map)
 
             pygame.display.flip()  # Update the display
 
@@ -305,6 +674,7 @@ def run_game():
         solved = False
 
         while not solved:
+            turn_start = pygame.time.get_ticks()  # The time spent computing the guess is taken off the turn delay
             ui.screen.fill(ui.color_map['White'])
 
             # Draw all guesses and feedbacks
@@ -315,19 +685,16 @@ def run_game():
             if not game.guesses:
                 # Initial guess is fixed (Knuth's recommendation)
                 # This guess is because it will eliminate the maximum number of codes as suggested by Knuth
-                # Calculate the number of repetitions needed for the initial guess
-                half_length = CODE_LENGTH // 2
-                initial_guess = tuple(COLORS[0] if i < half_length else COLORS[1] for i in range(CODE_LENGTH))
-
-                # Use the dynamic initial guess
-                guess = initial_guess
+                guess = knuth_initial_guess(CODE_LENGTH)
             else:
                 # Get the next guess using the minimax strategy
                 guess = game.next_guess()
 
             solved = game.play_turn(guess)
             pygame.display.flip()
-            pygame.time.delay(2000)  # Delay to show the guess and feedback
+            # Delay to show the guess and feedback
+            if not ui.wait(TURN_DELAY - (pygame.time.get_ticks() - turn_start)):
+                return  # Exit the game if the user closes the window
 
         if not ui.restart_screen(game):
             break  # Exit the game if the user closes the window or selects Exit